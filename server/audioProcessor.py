@@ -1,12 +1,16 @@
 import sys
 import os
 import librosa
+import numpy as np
 from pydub import AudioSegment
 import json
-import tempfile
 import subprocess
 import logging
 import random
+import contextlib
+import functools
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +18,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sample rate for beat analysis; detection gains nothing above 22.05 kHz
+ANALYSIS_SR = 22050
+
+# Sample rate the Spleeter models are trained on
+SPLEETER_SR = 44100
+
 
 def install_package(package):
     """Install a package using pip if it's not already installed."""
@@ -25,29 +35,73 @@ def install_package(package):
         raise
 
 
-# Try to import packages, install if not available
-try:
-    import madmom
-except ImportError:
-    logger.info("madmom not found, attempting to install...")
-    install_package("madmom")
-    import madmom
+def import_or_install(module, package):
+    """
+    Import a module on first use, installing its package if it is missing
 
-try:
-    from spleeter.separator import Separator
-except ImportError:
-    logger.info("spleeter not found, attempting to install...")
-    install_package("spleeter")
-    from spleeter.separator import Separator
+    madmom and spleeter (with TensorFlow) take seconds to import, so they are
+    only loaded by the code paths that need them.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        logger.info(f"{package} not found, attempting to install...")
+        install_package(package)
+        return importlib.import_module(module)
 
 
-def detect_tempo_and_beats(audio_path, method="auto"):
+def segment_to_mono(segment, target_sr=None):
+    """
+    Convert an AudioSegment into a mono float32 signal for analysis
+
+    Args:
+        segment: Decoded AudioSegment
+        target_sr: Sample rate to resample to, or None to keep the native rate
+
+    Returns:
+        tuple: (y, sr) with samples scaled to [-1, 1]
+    """
+    samples = np.asarray(segment.get_array_of_samples(), dtype=np.float32)
+    y = samples.reshape(-1, segment.channels).mean(axis=1)
+    y /= float(1 << (8 * segment.sample_width - 1))
+
+    sr = segment.frame_rate
+    if target_sr is not None and target_sr != sr:
+        y = librosa.resample(y, orig_sr=sr, target_sr=target_sr)
+        sr = target_sr
+    return y, sr
+
+
+@functools.lru_cache(maxsize=1)
+def _rnn_beat_processor():
+    """Return the madmom RNN beat processor, loading its networks once."""
+    beats = import_or_install("madmom.features.beats", "madmom")
+    return beats.RNNBeatProcessor()
+
+
+@functools.lru_cache(maxsize=1)
+def _beat_tracking_processor():
+    """Return the shared madmom beat tracking processor."""
+    beats = import_or_install("madmom.features.beats", "madmom")
+    return beats.BeatTrackingProcessor(fps=100)
+
+
+@functools.lru_cache(maxsize=1)
+def _tempo_estimation_processor():
+    """Return the shared madmom tempo estimation processor."""
+    tempo = import_or_install("madmom.features.tempo", "madmom")
+    return tempo.TempoEstimationProcessor(fps=100)
+
+
+def detect_tempo_and_beats(audio_path, method="auto", y=None, sr=None):
     """
     Detect tempo and beat positions in the audio file
 
     Args:
         audio_path: Path to the audio file
         method: Beat detection method ('auto', 'librosa', or 'madmom')
+        y: Already decoded mono signal, skips reloading audio_path
+        sr: Sample rate of y
 
     Returns:
         tuple: (tempo, beat_frames)
@@ -56,13 +110,15 @@ def detect_tempo_and_beats(audio_path, method="auto"):
 
     if method in ("librosa", "auto"):
         try:
-            y, sr = librosa.load(audio_path, sr=None)
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            beat_times = librosa.frames_to_time(beats, sr=sr)
+            if y is None:
+                y, sr = librosa.load(audio_path, sr=ANALYSIS_SR)
+            tempo, beat_times = librosa.beat.beat_track(
+                y=y, sr=sr, hop_length=512, units="time"
+            )
 
-            if len(beats) > 0 and tempo > 0:
+            if len(beat_times) > 0 and tempo > 0:
                 logger.info(
-                    f"Librosa detected tempo: {tempo} BPM with {len(beats)} beats"
+                    f"Librosa detected tempo: {tempo} BPM with {len(beat_times)} beats"
                 )
                 return tempo, beat_times
             elif method == "librosa":
@@ -78,16 +134,13 @@ def detect_tempo_and_beats(audio_path, method="auto"):
     # Fall back to madmom or if madmom was explicitly requested
     if method in ("madmom", "auto"):
         try:
-            # Use madmom for potentially more accurate beat tracking
-            from madmom.features.beats import RNNBeatProcessor, BeatTrackingProcessor
-            from madmom.features.tempo import TempoEstimationProcessor
-
-            # Process for beat detection
-            proc = RNNBeatProcessor()(audio_path)
-            beats = BeatTrackingProcessor(fps=100)(proc)
+            # Use madmom for potentially more accurate beat tracking;
+            # beats and tempo share the same RNN activations
+            proc = _rnn_beat_processor()(audio_path)
+            beats = _beat_tracking_processor()(proc)
 
             # Process for tempo detection
-            tempo_proc = TempoEstimationProcessor(fps=100)(proc)
+            tempo_proc = _tempo_estimation_processor()(proc)
             tempo = tempo_proc[0][0]  # Get the most likely tempo
 
             logger.info(f"Madmom detected tempo: {tempo} BPM with {len(beats)} beats")
@@ -100,72 +153,345 @@ def detect_tempo_and_beats(audio_path, method="auto"):
     return None, None
 
 
-def separate_audio_components(audio_path, output_dir):
+# Separators keyed by model name; loading the model dominates a single run
+_separator_cache = {}
+
+# TensorFlow device used for separation, resolved on first use
+_separation_device = None
+
+
+def _configure_tensorflow():
+    """
+    Configure TensorFlow threading and pick the device for Spleeter,
+    preferring a CUDA GPU
+
+    GPU separation needs a CUDA-enabled TensorFlow build (the `tensorflow`
+    wheel on Linux, or `tensorflow-gpu` on older releases) plus matching
+    CUDA/cuDNN libraries; without them TensorFlow only reports CPUs.
+    """
+    global _separation_device
+    if _separation_device is not None:
+        return _separation_device
+
+    import tensorflow as tf
+
+    # Let CPU convolutions use every core; this only takes effect before
+    # TensorFlow initializes its runtime, i.e. before the first Separator
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(os.cpu_count() or 0)
+        tf.config.threading.set_inter_op_parallelism_threads(2)
+    except RuntimeError as e:
+        logger.warning(f"Could not configure TensorFlow threads: {str(e)}")
+
+    gpus = tf.config.list_physical_devices("GPU")
+    for gpu in gpus:
+        try:
+            # Grow GPU memory on demand instead of reserving it all upfront
+            tf.config.experimental.set_memory_growth(gpu, True)
+        except RuntimeError as e:
+            logger.warning(f"Could not enable GPU memory growth: {str(e)}")
+
+    _separation_device = "/GPU:0" if gpus else "/CPU:0"
+    logger.info(f"Spleeter will run on {_separation_device}")
+    return _separation_device
+
+
+def _separation_context():
+    """Return a context manager placing separation on the selected device."""
+    device = _configure_tensorflow()
+    if device == "/CPU:0":
+        return contextlib.nullcontext()
+
+    import tensorflow as tf
+
+    return tf.device(device)
+
+
+def _get_separator(stems="spleeter:4stems"):
+    """Return a Separator for the given model, creating it on first use."""
+    if stems not in _separator_cache:
+        separator = import_or_install("spleeter.separator", "spleeter")
+        _configure_tensorflow()
+        logger.info(f"Loading Spleeter model {stems}")
+        _separator_cache[stems] = separator.Separator(stems)
+    return _separator_cache[stems]
+
+
+def warm_up_separator():
+    """
+    Build the Spleeter model graph and restore its checkpoint
+
+    Creating a Separator only reads its configuration; the TensorFlow graph
+    and weights are loaded on the first separation, so run one on a second
+    of silence.
+    """
+    separator = _get_separator()
+    with _separation_context():
+        separator.separate(np.zeros((SPLEETER_SR, 2), dtype=np.float32))
+
+
+def warm_up_models():
+    """
+    Load the Spleeter model and madmom processors ahead of the first track
+
+    Meant for long-running workers, so no request pays the model cold start.
+    """
+    warm_up_separator()
+    try:
+        _rnn_beat_processor()
+        _beat_tracking_processor()
+        _tempo_estimation_processor()
+    except Exception as e:
+        # madmom is only a fallback for beat detection; keep going without it
+        logger.warning(f"madmom warm-up failed: {str(e)}")
+
+
+def separate_audio_components(main_song):
     """
     Separate audio into components (vocals, drums, bass, other)
     using Spleeter
 
+    Separation runs on the decoded song in memory, so no stem files are
+    written and read back.
+
     Args:
-        audio_path: Path to the audio file
-        output_dir: Directory to save separated components
+        main_song: Decoded AudioSegment of the track
 
     Returns:
-        dict: Paths to separated audio files
+        dict: AudioSegment per component, or None on failure
     """
     logger.info("Starting audio separation with Spleeter")
 
     try:
-        # Create a separator with the 4stems configuration
-        separator = Separator("spleeter:4stems")
-
-        # Perform separation
+        # Reuse the process-wide separator with the 4stems configuration
+        separator = _get_separator()
 
-        main_song = AudioSegment.from_file(audio_path)
-        separator.separate_to_file(audio_path, output_dir)
-
-        # Get the base filename without extension
-        base_name = os.path.splitext(os.path.basename(audio_path))[0]
-        component_dir = os.path.join(output_dir, base_name)
-
-        # Paths to the separated components
-        components = {
-            "vocals": os.path.join(component_dir, "vocals.wav"),
-            "drums": os.path.join(component_dir, "drums.wav"),
-            "bass": os.path.join(component_dir, "bass.wav"),
-            "other": os.path.join(component_dir, "other.wav"),
-        }
+        # Spleeter models expect 44.1 kHz stereo float samples
+        song = main_song.set_frame_rate(SPLEETER_SR).set_channels(2)
+        waveform = np.asarray(song.get_array_of_samples(), dtype=np.float32)
+        waveform = waveform.reshape(-1, 2)
+        waveform /= float(1 << (8 * song.sample_width - 1))
 
-        # Verify files exist
-        for component, path in components.items():
-            if not os.path.exists(path):
-                logger.warning(f"Component {component} file not found at {path}")
+        # Perform separation
+        with _separation_context():
+            stems = separator.separate(waveform)
+
+        components = {}
+        for component in ("vocals", "drums", "bass", "other"):
+            stem = stems[component] * 32767
+            np.clip(stem, -32768, 32767, out=stem)
+            components[component] = AudioSegment(
+                data=stem.astype(np.int16).tobytes(),
+                sample_width=2,
+                frame_rate=SPLEETER_SR,
+                channels=stem.shape[1],
+            )
 
         logger.info("Audio separation completed successfully")
-        return [components, main_song]
+        return components
 
     except Exception as e:
         logger.error(f"Error during audio separation: {str(e)}")
         return None
 
 
-def pick_loudest_bars(stem, beats_ms, bars=4, beats_per_bar=4):
+def beat_energy_profile(segment, beats_ms):
+    """
+    Measure a segment's energy at every beat
+
+    The returned prefix sums let any run of beats be scored with two
+    lookups, so one profile serves every window length picked from it.
+
+    Args:
+        segment: AudioSegment to measure
+        beats_ms: Beat positions in milliseconds
+
+    Returns:
+        tuple: (cum_energy, idx) where cum_energy[i] is the sum of squared
+            samples before beat i and idx[i] is that beat's interleaved
+            sample offset
+    """
+    # Interleaved sample offset of each beat, aligned to frame boundaries
+    samples = np.asarray(segment.get_array_of_samples(), dtype=np.float32)
+    frames = (np.asarray(beats_ms) * segment.frame_rate / 1000).astype(np.int64)
+    idx = np.clip(frames * segment.channels, 0, len(samples))
+
+    # Square in place and accumulate per beat interval in float64; only the
+    # per-beat sums are kept, not a full-length prefix sum
+    np.square(samples, out=samples)
+    energy = np.array(
+        [
+            samples[start:end].sum(dtype=np.float64)
+            for start, end in zip(idx[:-1], idx[1:])
+        ]
+    )
+    cum_energy = np.concatenate(([0.0], np.cumsum(energy)))
+    return cum_energy, idx
+
+
+def loudest_bar_range(profile, beats_ms, bars=4, beats_per_bar=4):
+    """
+    Find the loudest run of bars from a beat energy profile
+
+    Args:
+        profile: (cum_energy, idx) from beat_energy_profile
+        beats_ms: Beat positions in milliseconds
+        bars: Number of bars to pick
+        beats_per_bar: Beats in one bar
+
+    Returns:
+        slice: Millisecond range of the loudest `bars` bars, or the whole
+            segment when there are too few beats
+    """
     total_beats = len(beats_ms)
     window = beats_per_bar * bars
-    max_rms = -1
-    pick_start = 0
     if total_beats < window + 1:
-        return stem
-    for i in range(total_beats - window):
-        start_ms = int(beats_ms[i])
-        end_ms = int(beats_ms[i + window])
-        segment = stem[start_ms:end_ms]
-        rms = segment.rms
-        if rms > max_rms:
-            max_rms = rms
-            pick_start = i
-    start_ms = int(beats_ms[pick_start])
-    end_ms = int(beats_ms[pick_start + window])
-    return stem[start_ms:end_ms]
+        return slice(None)
+
+    cum_energy, idx = profile
+    sums = cum_energy[window:] - cum_energy[:-window]
+    mean_sq = sums / np.maximum(idx[window:] - idx[:-window], 1)
+    pick_start = int(np.argmax(mean_sq))
+
+    return slice(int(beats_ms[pick_start]), int(beats_ms[pick_start + window]))
+
+
+def join_segments(segments, gains_db=None):
+    """
+    Concatenate AudioSegments that share frame rate, sample width and channels
+
+    Same result as sum(segments), but the raw sample buffers are joined in a
+    single copy instead of building a new segment for every addition. Gains
+    are applied while joining, saturating like pydub's apply_gain.
+
+    Args:
+        segments: Non-empty list of AudioSegments
+        gains_db: Optional gain in dB for each segment
+
+    Returns:
+        AudioSegment: The segments played back to back
+    """
+    first = segments[0]
+    if gains_db is None:
+        gains_db = [0] * len(segments)
+
+    dtype = np.dtype(f"<i{first.sample_width}")
+    limits = np.iinfo(dtype)
+    parts = []
+    for segment, gain_db in zip(segments, gains_db):
+        if not gain_db:
+            parts.append(segment.raw_data)
+            continue
+        samples = np.frombuffer(segment.raw_data, dtype=dtype).astype(np.float32)
+        samples *= 10 ** (gain_db / 20)
+        np.clip(samples, limits.min, limits.max, out=samples)
+        parts.append(samples.astype(dtype).tobytes())
+
+    return AudioSegment(
+        data=b"".join(parts),
+        sample_width=first.sample_width,
+        frame_rate=first.frame_rate,
+        channels=first.channels,
+    )
+
+
+# Gain applied to each stem when it is joined into the intro/outro
+STEM_GAINS_DB = {"other": 9}
+
+# ffmpeg raw sample formats for pydub sample widths
+_RAW_SAMPLE_FORMATS = {1: "s8", 2: "s16le", 4: "s32le"}
+
+
+# Bytes written to ffmpeg per pipe write when streaming a long segment
+EXPORT_BLOCK_BYTES = 1 << 20
+
+
+def crossfade_chunks(first, second, crossfade_ms, block_bytes=EXPORT_BLOCK_BYTES):
+    """
+    Yield the raw samples of `first` crossfaded into `second`
+
+    Produces the same audio as first.append(second, crossfade=crossfade_ms),
+    but only the crossfade region is built as a new segment; the rest of
+    both buffers is yielded as views, `second` in blocks of `block_bytes`.
+
+    Args:
+        first: Leading AudioSegment
+        second: Trailing AudioSegment with the same sample width, frame
+            rate and channel count as `first`
+        crossfade_ms: Length of the crossfade in milliseconds
+        block_bytes: Maximum size of each chunk taken from `second`
+
+    Yields:
+        bytes-like: Consecutive raw sample buffers
+    """
+    head = second[:crossfade_ms]
+    xf = first[-crossfade_ms:].fade(to_gain=-120, start=0, end=float("inf"))
+    xf *= head.fade(from_gain=-120, start=0, end=float("inf"))
+
+    yield memoryview(first.raw_data)[: len(first.raw_data) - len(xf.raw_data)]
+    yield xf.raw_data
+
+    tail = memoryview(second.raw_data)
+    for offset in range(len(head.raw_data), len(tail), block_bytes):
+        yield tail[offset : offset + block_bytes]
+
+
+def stream_export(chunks, sample_width, frame_rate, channels, output_path):
+    """
+    Encode raw sample buffers by streaming them into a single ffmpeg process
+
+    Unlike AudioSegment.export this writes no intermediate WAV file and never
+    needs the whole mix in one buffer; the output format is inferred by
+    ffmpeg from the file extension.
+
+    Args:
+        chunks: Iterable of raw sample buffers, in playback order
+        sample_width: Bytes per sample
+        frame_rate: Sample rate in Hz
+        channels: Number of interleaved channels
+        output_path: Destination file
+    """
+    command = [
+        AudioSegment.converter,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        _RAW_SAMPLE_FORMATS[sample_width],
+        "-ar",
+        str(frame_rate),
+        "-ac",
+        str(channels),
+        "-i",
+        "pipe:0",
+        output_path,
+    ]
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        for chunk in chunks:
+            process.stdin.write(chunk)
+        process.stdin.close()
+    except BrokenPipeError:
+        # ffmpeg exited early; its exit status and stderr explain why
+        pass
+    except BaseException:
+        # Producing a chunk failed; don't leave ffmpeg or a truncated file
+        process.kill()
+        process.wait()
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    stderr = process.stderr.read()
+    if process.wait() != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to encode {output_path}: "
+            f"{stderr.decode(errors='replace')}"
+        )
 
 
 def create_extended_mix(
@@ -177,7 +503,26 @@ def create_extended_mix(
     tempo,
     beat_times,
     main_song,
+    save_dir=None,
 ):
+    """
+    Build the extended mix and write it, plus its shuffle order JSON
+
+    Args:
+        components: AudioSegment per separated component
+        output_path: Path to save extended version
+        intro_bars: Number of bars for intro
+        outro_bars: Number of bars for outro
+        preserve_vocals: Whether to include vocals in extended sections
+        tempo: Detected tempo in BPM
+        beat_times: Beat positions in seconds
+        main_song: Decoded AudioSegment of the original track
+        save_dir: Directory for the shuffle order JSON, defaults to the
+            directory of output_path
+
+    Returns:
+        bool: Success or failure
+    """
     logger.info(
         f"Creating extended mix with {intro_bars} bars intro and {outro_bars} bars outro"
     )
@@ -201,28 +546,26 @@ def create_extended_mix(
             except:
                 pass
 
-        drums = AudioSegment.from_file(components["drums"])
-        bass = AudioSegment.from_file(components["bass"])
-        other = AudioSegment.from_file(components["other"])
-        vocals = AudioSegment.from_file(components["vocals"])
-        bass = bass + 12
+        drums = components["drums"]
+        other = components["other"]
+        vocals = components["vocals"]
 
         beat_times_ms = [t * 1000 for t in beat_times]
 
+        # Pick the loudest bars of the full mix once and cut every stem at
+        # that range, so the stems stay aligned with each other
+        profile = beat_energy_profile(main_song, beat_times_ms)
+        intro_range = loudest_bar_range(profile, beat_times_ms, bars=intro_bars)
+        outro_range = loudest_bar_range(profile, beat_times_ms, bars=outro_bars)
+
         # Pick stems for intro and outro
-        full_intro_drums = pick_loudest_bars(drums, beat_times_ms, bars=intro_bars)
-        full_intro_bass = pick_loudest_bars(bass, beat_times_ms, bars=intro_bars)
-        full_intro_other = pick_loudest_bars(
-            other, beat_times_ms, bars=intro_bars
-        ).apply_gain(9)
-        intro_vocals = pick_loudest_bars(vocals, beat_times_ms, bars=intro_bars)
-
-        full_outro_drums = pick_loudest_bars(drums, beat_times_ms, bars=outro_bars)
-        full_outro_bass = pick_loudest_bars(bass, beat_times_ms, bars=outro_bars)
-        full_outro_other = pick_loudest_bars(
-            other, beat_times_ms, bars=outro_bars
-        ).apply_gain(9)
-        outro_vocals = pick_loudest_bars(vocals, beat_times_ms, bars=outro_bars)
+        full_intro_drums = drums[intro_range]
+        full_intro_other = other[intro_range]
+        intro_vocals = vocals[intro_range]
+
+        full_outro_drums = drums[outro_range]
+        full_outro_other = other[outro_range]
+        outro_vocals = vocals[outro_range]
 
         # Set seed based on version for consistent shuffling per version
         random.seed(version * 42)
@@ -250,33 +593,46 @@ def create_extended_mix(
         ]
         outro_zipped = list(zip(outro_labels, outro_segments))
         random.shuffle(outro_zipped)
-        outro_components = [seg for (label, seg) in outro_zipped]
         shuffled_outro_order = [label for (label, seg) in outro_zipped]
 
         # Reset random seed
         random.seed()
 
         # Mix creation
-        full_intro = sum(intro_components).fade_in(2000)
-        full_outro = sum(outro_components).fade_out(2000)
+        intro_gains = [STEM_GAINS_DB.get(label, 0) for label in shuffled_intro_order]
+        full_intro = join_segments(intro_components, intro_gains).fade_in(2000)
 
+        # Match the intro to the main song so the song's buffer can be
+        # streamed to ffmpeg as-is, without building the joined mix
         main_audio = main_song
-        extended_mix = full_intro.append(main_audio, crossfade=500)
-
-        extended_mix.export(output_path, format=os.path.splitext(output_path)[1][1:])
+        full_intro = (
+            full_intro.set_frame_rate(main_audio.frame_rate)
+            .set_channels(main_audio.channels)
+            .set_sample_width(main_audio.sample_width)
+        )
+        stream_export(
+            crossfade_chunks(full_intro, main_audio, 500),
+            main_audio.sample_width,
+            main_audio.frame_rate,
+            main_audio.channels,
+            output_path,
+        )
         logger.info(f"Extended mix created successfully and saved to {output_path}")
 
         # Save the shuffle order JSON
         output_base = os.path.splitext(os.path.basename(output_path))[0]
-        save_dir = r"C:\Users\Dhanush\Desktop\softwareLabs"
-        os.makedirs(save_dir, exist_ok=True)
+        if save_dir is None:
+            # The output's directory already exists since the mix was written
+            save_dir = os.path.dirname(os.path.abspath(output_path))
+        else:
+            os.makedirs(save_dir, exist_ok=True)
         shuffle_json_path = os.path.join(save_dir, f"{output_base}_shuffle_order.json")
         shuffle_info = {
             "intro_shuffle_order": shuffled_intro_order,
             "outro_shuffle_order": shuffled_outro_order,
         }
         with open(shuffle_json_path, "w") as f:
-            json.dump(shuffle_info, f, indent=2)
+            f.write(json.dumps(shuffle_info))
         logger.info(f"Shuffle order written to {shuffle_json_path}")
 
         return True
@@ -286,6 +642,73 @@ def create_extended_mix(
         return False
 
 
+def analyze_track(input_path, beat_detection="auto"):
+    """
+    Decode a track and detect its tempo and beats
+
+    Args:
+        input_path: Path to input audio file
+        beat_detection: Method for beat detection
+
+    Returns:
+        tuple: (main_song, tempo, beat_times), or None if beat detection failed
+    """
+    # Decode once; every stage after this reuses the buffer
+    main_song = AudioSegment.from_file(input_path)
+    y, sr = segment_to_mono(main_song, target_sr=ANALYSIS_SR)
+
+    tempo, beat_times = detect_tempo_and_beats(
+        input_path, method=beat_detection, y=y, sr=sr
+    )
+    if tempo is None or beat_times is None or len(beat_times) == 0:
+        logger.error(f"Beat detection failed for {input_path}, cannot proceed")
+        return None
+    return main_song, tempo, beat_times
+
+
+def render_track(
+    output_path,
+    intro_bars,
+    outro_bars,
+    preserve_vocals,
+    analysis,
+    save_dir=None,
+):
+    """
+    Separate an analyzed track and write its extended mix
+
+    Args:
+        output_path: Path to save extended version
+        intro_bars: Number of bars for intro
+        outro_bars: Number of bars for outro
+        preserve_vocals: Whether to include vocals in extended sections
+        analysis: (main_song, tempo, beat_times) from analyze_track
+        save_dir: Directory for the shuffle order JSON, defaults to the
+            directory of output_path
+
+    Returns:
+        bool: Success or failure
+    """
+    main_song, tempo, beat_times = analysis
+
+    components = separate_audio_components(main_song)
+    if components is None:
+        logger.error("Audio separation failed, cannot proceed")
+        return False
+
+    return create_extended_mix(
+        components,
+        output_path,
+        intro_bars,
+        outro_bars,
+        preserve_vocals,
+        tempo,
+        beat_times,
+        main_song,
+        save_dir,
+    )
+
+
 def process_audio(
     input_path,
     output_path,
@@ -293,6 +716,7 @@ def process_audio(
     outro_bars=16,
     preserve_vocals=True,
     beat_detection="auto",
+    save_dir=None,
 ):
     """
     Main function to process audio and create extended DJ version
@@ -304,6 +728,8 @@ def process_audio(
         outro_bars: Number of bars for outro
         preserve_vocals: Whether to include vocals in extended sections
         beat_detection: Method for beat detection
+        save_dir: Directory for the shuffle order JSON, defaults to the
+            directory of output_path
 
     Returns:
         bool: Success or failure
@@ -319,46 +745,119 @@ def process_audio(
         outro_bars = int(outro_bars)
         preserve_vocals = str(preserve_vocals).lower() == "true"
 
-        # Create temporary directory for processing
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Step 1: Detect tempo and beats
-            tempo, beat_times = detect_tempo_and_beats(
-                input_path, method=beat_detection
-            )
-            if tempo is None or beat_times is None or len(beat_times) == 0:
-                logger.error("Beat detection failed, cannot proceed")
-                return False
-
-            # Step 2: Separate audio components
-            components, main_song = separate_audio_components(input_path, temp_dir)
-            if components is None:
-                logger.error("Audio separation failed, cannot proceed")
-                return False
-
-            # Step 3: Create extended mix
-            success = create_extended_mix(
-                components,
-                output_path,
-                intro_bars,
-                outro_bars,
-                preserve_vocals,
-                tempo,
-                beat_times,
-                main_song,
-            )
+        # Step 1: Decode and detect tempo and beats
+        analysis = analyze_track(input_path, beat_detection)
+        if analysis is None:
+            return False
 
-            return success
+        # Steps 2 and 3: Separate audio components and create extended mix
+        return render_track(
+            output_path,
+            intro_bars,
+            outro_bars,
+            preserve_vocals,
+            analysis,
+            save_dir,
+        )
 
     except Exception as e:
         logger.error(f"Error in audio processing: {str(e)}")
         return False
 
 
+def process_audio_batch(jobs, max_workers=2):
+    """
+    Process several tracks while loading the Spleeter model only once
+
+    Tracks are handled in windows of `max_workers`: beat detection runs
+    concurrently within a window (librosa spends most of its time in
+    GIL-releasing NumPy/FFT code), then separation and mixing run one track
+    at a time on the shared separator. Only one window of decoded tracks is
+    held in memory at a time.
+
+    Args:
+        jobs: List of dicts with process_audio arguments (input_path,
+            output_path and optionally intro_bars, outro_bars,
+            preserve_vocals, beat_detection, save_dir)
+        max_workers: Tracks decoded and analyzed at once
+
+    Returns:
+        list: Success flag for each job, in input order
+    """
+    logger.info(f"Starting batch processing of {len(jobs)} tracks")
+
+    def analyze(job):
+        try:
+            return analyze_track(
+                job["input_path"], job.get("beat_detection", "auto")
+            )
+        except Exception as e:
+            logger.error(f"Error analyzing {job.get('input_path')}: {str(e)}")
+            return None
+
+    # Load the model up front so a broken install fails the batch before any
+    # track is decoded
+    try:
+        warm_up_separator()
+    except Exception as e:
+        logger.error(f"Error loading Spleeter model: {str(e)}")
+        return [False] * len(jobs)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(jobs), max_workers):
+            window = jobs[start : start + max_workers]
+            analyses = list(executor.map(analyze, window))
+
+            for i, job in enumerate(window):
+                # Release each decoded track as soon as it is rendered
+                analysis, analyses[i] = analyses[i], None
+                if analysis is None:
+                    results.append(False)
+                    continue
+                try:
+                    results.append(
+                        render_track(
+                            job["output_path"],
+                            int(job.get("intro_bars", 16)),
+                            int(job.get("outro_bars", 16)),
+                            str(job.get("preserve_vocals", True)).lower() == "true",
+                            analysis,
+                            job.get("save_dir"),
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing {job['input_path']}: {str(e)}")
+                    results.append(False)
+                del analysis
+
+    return results
+
+
 if __name__ == "__main__":
+    # Batch mode: a JSON file holding a list of process_audio argument dicts
+    if len(sys.argv) == 3 and sys.argv[1] == "--batch":
+        with open(sys.argv[2]) as f:
+            jobs = json.load(f)
+
+        results = process_audio_batch(jobs)
+        print(
+            json.dumps(
+                [
+                    {"status": "success", "output_path": job["output_path"]}
+                    if success
+                    else {"status": "error", "message": "Failed to process audio"}
+                    for job, success in zip(jobs, results)
+                ]
+            )
+        )
+        sys.exit(0 if all(results) else 1)
+
     # Check if required arguments are provided
     if len(sys.argv) < 3:
         print(
-            "Usage: python audioProcessor.py <input_path> <output_path> [intro_bars] [outro_bars] [preserve_vocals] [beat_detection]"
+            "Usage: python audioProcessor.py <input_path> <output_path> [intro_bars] [outro_bars] [preserve_vocals] [beat_detection] [save_dir]\n"
+            "       python audioProcessor.py --batch <jobs.json>"
         )
         sys.exit(1)
 
@@ -369,10 +868,17 @@ if __name__ == "__main__":
     outro_bars = int(sys.argv[4]) if len(sys.argv) > 4 else 16
     preserve_vocals = sys.argv[5].lower() == "true" if len(sys.argv) > 5 else True
     beat_detection = sys.argv[6] if len(sys.argv) > 6 else "auto"
+    save_dir = sys.argv[7] if len(sys.argv) > 7 else None
 
     # Process the audio
     success = process_audio(
-        input_path, output_path, intro_bars, outro_bars, preserve_vocals, beat_detection
+        input_path,
+        output_path,
+        intro_bars,
+        outro_bars,
+        preserve_vocals,
+        beat_detection,
+        save_dir,
     )
 
     if success:
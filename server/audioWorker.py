@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import logging
+
+from audioProcessor import process_audio, warm_up_models
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def handle_job(job):
+    """
+    Run one processing job
+
+    Args:
+        job: Dict with an id and process_audio arguments
+
+    Returns:
+        dict: Result message for the job
+    """
+    success = process_audio(
+        job["input_path"],
+        job["output_path"],
+        job.get("intro_bars", 16),
+        job.get("outro_bars", 16),
+        job.get("preserve_vocals", True),
+        job.get("beat_detection", "auto"),
+        job.get("save_dir"),
+    )
+    if success:
+        return {
+            "id": job.get("id"),
+            "status": "success",
+            "output_path": job["output_path"],
+        }
+    return {
+        "id": job.get("id"),
+        "status": "error",
+        "message": "Failed to process audio",
+    }
+
+
+def serve(requests, responses):
+    """
+    Answer newline-delimited JSON jobs until the input stream closes
+
+    Args:
+        requests: Text stream with one JSON job per line
+        responses: Text stream that receives one JSON result per line
+    """
+    for line in requests:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            logger.error(f"Invalid job message: {str(e)}")
+            result = {"id": None, "status": "error", "message": "Invalid job"}
+        else:
+            try:
+                result = handle_job(job)
+            except Exception as e:
+                logger.error(f"Error handling job: {str(e)}")
+                result = {"id": job.get("id"), "status": "error", "message": str(e)}
+        responses.write(json.dumps(result) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    # Keep a private copy of stdout for the protocol, then point fd 1 at
+    # stderr so nothing else (including child processes such as pip or
+    # ffmpeg) can write into the reply channel
+    sys.stdout.flush()
+    responses = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    logger.info("Warming up audio worker")
+    warm_up_models()
+    logger.info("Audio worker ready")
+    serve(sys.stdin, responses)
@@ -0,0 +1,116 @@
+/** @format */
+
+import path from "path";
+import { PythonShell } from "python-shell";
+
+export interface AudioJob {
+	inputPath: string;
+	outputPath: string;
+	introBars: number;
+	outroBars: number;
+	preserveVocals: boolean;
+	beatDetection: string;
+	// Directory for the shuffle order JSON; defaults to the output's directory
+	saveDir?: string;
+}
+
+interface WorkerResult {
+	id: number | null;
+	status: "success" | "error";
+	output_path?: string;
+	message?: string;
+}
+
+interface PendingJob {
+	resolve: (result: WorkerResult) => void;
+	reject: (error: Error) => void;
+}
+
+// One long-lived Python process keeps Spleeter and madmom loaded between
+// jobs; it answers newline-delimited JSON jobs in the order they are sent.
+let worker: PythonShell | null = null;
+let nextJobId = 1;
+const pendingJobs = new Map<number, PendingJob>();
+
+function failPendingJobs(error: Error) {
+	pendingJobs.forEach((job) => job.reject(error));
+	pendingJobs.clear();
+}
+
+function getWorker(): PythonShell {
+	if (worker) {
+		return worker;
+	}
+
+	const shell = new PythonShell("audioWorker.py", {
+		mode: "json",
+		pythonPath: process.platform === "win32" ? "python" : "python3",
+		pythonOptions: ["-u"],
+		scriptPath: path.join(process.cwd(), "server"),
+	});
+
+	shell.on("message", (result: WorkerResult) => {
+		if (result.id === null) {
+			console.error("Audio worker error:", result.message);
+			return;
+		}
+		const job = pendingJobs.get(result.id);
+		if (!job) {
+			return;
+		}
+		pendingJobs.delete(result.id);
+		if (result.status === "success") {
+			job.resolve(result);
+		} else {
+			job.reject(new Error(result.message || "Failed to process audio"));
+		}
+	});
+
+	shell.on("stderr", (line: string) => {
+		console.log("[audio worker]", line);
+	});
+
+	// Start a fresh worker on the next job if this one dies
+	const onExit = (error?: Error) => {
+		// A replaced worker must not fail jobs sent to its successor
+		if (worker !== shell) {
+			return;
+		}
+		worker = null;
+		failPendingJobs(error || new Error("Audio worker exited"));
+	};
+	shell.on("pythonError", onExit);
+	shell.on("close", () => onExit());
+
+	// Also raised for unparsable stdout while the process is still running;
+	// kill it so an orphaned worker doesn't keep the models in memory
+	shell.on("error", (error: Error) => {
+		onExit(error);
+		shell.kill();
+	});
+
+	worker = shell;
+	return shell;
+}
+
+export function processAudio(job: AudioJob): Promise<WorkerResult> {
+	return new Promise((resolve, reject) => {
+		const id = nextJobId++;
+		pendingJobs.set(id, { resolve, reject });
+		try {
+			getWorker().send({
+				id,
+				input_path: job.inputPath,
+				output_path: job.outputPath,
+				intro_bars: job.introBars,
+				outro_bars: job.outroBars,
+				preserve_vocals: job.preserveVocals,
+				beat_detection: job.beatDetection,
+				save_dir: job.saveDir,
+			});
+		} catch (error) {
+			pendingJobs.delete(id);
+			reject(error);
+		}
+	});
+}
@@ -13,6 +13,7 @@ import fs from "fs";
 import { exec, spawn } from "child_process";
 import { z } from "zod";
 import { PythonShell } from "python-shell";
+import { processAudio } from "./audioWorker";
 
 // Setup multer for file uploads
 const uploadsDir = path.join(process.cwd(), "uploads");
@@ -174,9 +175,19 @@ export async function registerRoutes(app: Express): Promise<Server> {
 					fs.unlinkSync(track.originalPath);
 				}
 				if (track.extendedPaths) {
-					for (const path of track.extendedPaths) {
-						if (fs.existsSync(path)) {
-							fs.unlinkSync(path);
+					for (const extendedPath of track.extendedPaths) {
+						// Each version also has its shuffle order JSON alongside it
+						const shuffleOrderPath = path.join(
+							path.dirname(extendedPath),
+							`${path.basename(
+								extendedPath,
+								path.extname(extendedPath)
+							)}_shuffle_order.json`
+						);
+						for (const filePath of [extendedPath, shuffleOrderPath]) {
+							if (fs.existsSync(filePath)) {
+								fs.unlinkSync(filePath);
+							}
 						}
 					}
 				}
@@ -236,20 +247,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
 				`${outputBase}_extended_v${version + 1}${fileExt}`
 			);
 
-			// Execute the Python script for audio processing
-			const options = {
-				mode: "text",
-				pythonPath: process.platform === "win32" ? "python" : "python3",
-				pythonOptions: ["-u"],
-				scriptPath: path.join(process.cwd(), "server"),
-				args: [
-					track.originalPath,
-					outputPath,
-					settings.introLength.toString(),
-					settings.outroLength.toString(),
-					settings.preserveVocals.toString(),
-					settings.beatDetection,
-				],
+			// Audio processing job for the persistent Python worker
+			const job = {
+				inputPath: track.originalPath,
+				outputPath,
+				introBars: settings.introLength,
+				outroBars: settings.outroLength,
+				preserveVocals: settings.preserveVocals,
+				beatDetection: settings.beatDetection,
 			};
 
 			// Send initial response
@@ -260,7 +265,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
 			});
 
 			// Start processing in background
-			PythonShell.run("audioProcessor.py", options)
+			processAudio(job)
 				.then(async (results) => {
 					console.log("Processing complete:", results);
 
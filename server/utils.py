@@ -4,12 +4,27 @@ import json
 import librosa
 import numpy as np
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def estimate_tempo(y, sr):
+    """
+    Estimate the global tempo of a signal
+    
+    Args:
+        y: Audio signal
+        sr: Sample rate of y
+        
+    Returns:
+        float: Tempo in BPM
+    """
+    onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+    return librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
+
 def get_audio_info(file_path):
     """
     Extract information from audio file including format, duration, and BPM
@@ -27,22 +42,30 @@ def get_audio_info(file_path):
         extension = os.path.splitext(file_path)[1].lower()
         format_type = extension[1:]  # Remove the dot
         
-        # Load audio for librosa analysis
-        y, sr = librosa.load(file_path, sr=None)
+        # Load audio for librosa analysis; tempo and key don't need the native rate
+        y, sr = librosa.load(file_path, sr=22050)
         
         # Get duration
         duration_sec = librosa.get_duration(y=y, sr=sr)
         
+        # Tempo, chroma and the pydub decode are independent and spend their
+        # time in GIL-releasing NumPy/FFT code or ffmpeg, so overlap them
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            tempo_future = executor.submit(estimate_tempo, y, sr)
+            # A single high-resolution chroma serves both the key and the mode guess
+            chroma_future = executor.submit(
+                librosa.feature.chroma_cqt, y=y, sr=sr, bins_per_octave=12*3
+            )
+            audio_future = executor.submit(AudioSegment.from_file, file_path)
+            
+            tempo = tempo_future.result()
+            chroma = chroma_future.result()
+            audio = audio_future.result()
+        
         # Get bitrate using pydub
-        audio = AudioSegment.from_file(file_path)
         bitrate = audio.frame_rate * audio.sample_width * audio.channels * 8
         
-        # Detect tempo
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
-        
         # Detect key (this is a simplified approach)
-        chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
         chroma_sum = np.sum(chroma, axis=1)
         key_idx = np.argmax(chroma_sum)
         
@@ -52,10 +75,11 @@ def get_audio_info(file_path):
         
         # Determine if it's major or minor
         # This is simplistic; a real implementation would use more advanced techniques
-        minor_chroma = librosa.feature.chroma_cqt(y=y, sr=sr, bins_per_octave=12*3)
-        minor_sum = np.sum(minor_chroma[9:], axis=1) / np.sum(minor_chroma, axis=1)
+        # Compare the minor and major thirds above the detected tonic
+        minor_third = chroma_sum[(key_idx + 3) % 12]
+        major_third = chroma_sum[(key_idx + 4) % 12]
         
-        if np.mean(minor_sum) > 0.2:  # Simple threshold for minor
+        if minor_third > major_third:
             key += " minor"
         else:
             key += " major"